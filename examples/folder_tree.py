@@ -13,6 +13,7 @@ import fnmatch
 import os
 import zlib
 import argparse
+from pathlib import PurePath
 
 DEBUG = 0
 FILECOUNT = 0
@@ -52,29 +53,30 @@ dir_tree.create_node("Root", rootPath)  # root node
 
 
 def crc32(data):
-    data = bytes(data, "UTF-8")
+    raw = bytes(data, "UTF-8")
+    # zlib.crc32 is unsigned on Python 3, format it as fixed-width hex
+    value = "%08x" % zlib.crc32(raw)
 
     if DEBUG:
         print("++++++ CRC32 ++++++")
-        print("input: " + str(data))
-        print("crc32: " + hex(zlib.crc32(data) & 0xFFFFFFFF))
+        print("input: " + str(raw))
+        print("crc32: " + value)
         print("+++++++++++++++++++")
-    return hex(
-        zlib.crc32(data) & 0xFFFFFFFF
-    )  # crc32 returns a signed value, &-ing it will match py3k
+    return value
 
 
 parent = rootPath
 i = 1
 
 # calculating start depth
-start_depth = rootPath.count("/")
+start_depth = len(PurePath(rootPath).parts)
 
 
-def get_noteid(depth, root, dir):
+def get_noteid(depth, dir, dir_crc):
     """get_noteid returns
     - depth contains the current depth of the folder hierarchy
     - dir contains the current directory
+    - dir_crc contains the crc32 of the absolute path of dir
 
     Function returns a string containing the current depth, the folder name and unique ID build by hashing the
     absolute path of the directory. All spaces are replaced by '_'
@@ -82,39 +84,28 @@ def get_noteid(depth, root, dir):
     <depth>_<dirname>+++<crc32>
     e.g. 2_Folder_XYZ_1+++<crc32>
     """
-    return (
-        str(str(depth) + "_" + dir).replace(" ", "_")
-        + "+++"
-        + crc32(os.path.join(root, dir))
-    )
+    return str(str(depth) + "_" + dir).replace(" ", "_") + "+++" + dir_crc
 
 
 # TODO: Verzeichnistiefe pruefen: Was ist mit sowas /mp3/
 
 
-def get_parentid(current_depth, root, dir):
+def get_parentid(current_depth, root, parent_dir, root_crc):
     # special case for the 'root' of the tree
     # because we don't want a cryptic root-name
     if current_depth == 0:
         return root
 
-    # looking for parent directory
-    # e.g. /home/user1/mp3/folder1/parent_folder/current_folder
-    # get 'parent_folder'
-
-    search_string = os.path.join(root, dir)
-    pos2 = search_string.rfind("/")
-    pos1 = search_string.rfind("/", 0, pos2)
-    parent_dir = search_string[pos1 + 1 : pos2]  # noqa: E203
+    # parent_dir is the name of the parent directory, i.e. the last
+    # component of root, e.g. 'parent_folder' for
+    # /home/user1/mp3/folder1/parent_folder/current_folder
     parentid = (
-        str(current_depth - 1)
-        + "_"
-        + parent_dir.replace(" ", "_")
-        + "+++"
-        + crc32(root)
+        str(current_depth - 1) + "_" + parent_dir.replace(" ", "_") + "+++" + root_crc
     )
+    # the parent is missing if it could not be added itself
+    if not dir_tree.contains(parentid):
+        return None
     return parentid
-    # TODO: catch error
 
 
 def print_node(dir, node_id, parent_id):
@@ -126,63 +117,73 @@ def print_node(dir, node_id, parent_id):
 
 
 def crawler():
-    global DIRCOUNT
-    global FILECOUNT
+    dircount = 0
+    filecount = 0
+
+    # crc32 of each directory, kept from its own id until it is walked as root
+    dir_crcs = {rootPath: crc32(rootPath)}
 
     for root, dirs, files in os.walk(rootPath):
+        current_depth = len(PurePath(root).parts) - start_depth
+        root_crc = dir_crcs.pop(root)
+        root_name = os.path.basename(root)
+
         # +++ DIRECTORIES +++
         for dir in dirs:
-            # calculating current depth
-            current_depth = os.path.join(root, dir).count("/") - start_depth
-
             if DEBUG:
                 print("current: " + os.path.join(root, dir))
 
-            node_id = get_noteid(current_depth, root, dir)
-            parent_id = str(get_parentid(current_depth, root, dir))
+            path = os.path.join(root, dir)
+            dir_crcs[path] = crc32(path)
+            node_id = get_noteid(current_depth, dir, dir_crcs[path])
+            parent_id = get_parentid(current_depth, root, root_name, root_crc)
 
-            if parent_id == str(None):
-                DIR_ERRORLIST.append(os.path.join(root, dir))
+            if parent_id is None:
+                DIR_ERRORLIST.append(path)
+                continue
 
             if DEBUG:
                 print_node(dir, node_id, parent_id)
 
             # create node
             dir_tree.create_node(dir, node_id, parent_id)
-            DIRCOUNT += 1
+            dircount += 1
 
         # +++ FILES +++
-        for filename in fnmatch.filter(files, pattern):
-            if dir in folder_blacklist:
-                continue
-
-            # calculating current depth
-            current_depth = os.path.join(root, filename).count("/") - start_depth
+        if root_name in folder_blacklist:
+            continue
 
+        for filename in fnmatch.filter(files, pattern):
             if DEBUG:
                 print("current: " + os.path.join(root, filename))
 
-            node_id = get_noteid(current_depth, root, filename)
-            parent_id = str(get_parentid(current_depth, root, filename))
+            node_id = get_noteid(
+                current_depth, filename, crc32(os.path.join(root, filename))
+            )
+            parent_id = get_parentid(current_depth, root, root_name, root_crc)
 
-            if parent_id == str(None):
-                FILE_ERRORLIST.append(os.path.join(root, dir))
+            if parent_id is None:
+                FILE_ERRORLIST.append(os.path.join(root, filename))
+                continue
 
             if DEBUG:
                 print_node(filename, node_id, parent_id)
 
             # create node
             dir_tree.create_node(filename, node_id, parent_id)
-            FILECOUNT += 1
+            filecount += 1
+
+    return dircount, filecount
 
 
 if PROFILING == 0:
-    crawler()
+    DIRCOUNT, FILECOUNT = crawler()
 if PROFILING == 1:
-    t1 = timeit.Timer("crawler()", "from __main__ import crawler")
-    print("time:      " + str(t1.timeit(number=1)))
+    t0 = timeit.default_timer()
+    DIRCOUNT, FILECOUNT = crawler()
+    print("time:      " + str(timeit.default_timer() - t0))
 if PROFILING == 2:
-    cProfile.run("crawler()")
+    cProfile.run("DIRCOUNT, FILECOUNT = crawler()")
 
 
 print("filecount: " + str(FILECOUNT))
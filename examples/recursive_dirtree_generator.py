@@ -8,24 +8,18 @@ It could be useful to implement Directory Tree data structure
 """
 
 import treelib
-import random
-import hashlib
-from string import digits, letters
-import sys
+import base64
+import itertools
+import os
 
 
 MAX_FILES_PER_DIR = 10
-
-
-def range2(stop):
-    if sys.version_info[0] < 3:
-        return xrange(stop)  # noqa: F821
-    else:
-        return range(stop)
+NODE_IDS = itertools.count(1)
 
 
 def get_random_string(length):
-    return "".join(random.choice(digits + letters) for _ in range2(length))
+    raw = base64.urlsafe_b64encode(os.urandom(length * 3 // 4 + 3))
+    return raw[:length].decode("ascii")
 
 
 def build_recursive_tree(tree, base, depth, width):
@@ -39,29 +33,29 @@ def build_recursive_tree(tree, base, depth, width):
     Returns:
 
     """
-    if depth >= 0:
-        depth -= 1
-        for i in range2(width):
+    stack = [(base.identifier, depth)]
+    while stack:
+        parent, depth = stack.pop()
+        if depth < 0:
+            continue
+        for i in range(width):
             directory = Directory()
-            tree.create_node(
+            node = tree.create_node(
                 "{0}".format(directory.name),
-                "{0}".format(hashlib.md5(directory.name)),
-                parent=base.identifier,
+                str(next(NODE_IDS)),
+                parent=parent,
                 data=directory,
-            )  # node identifier is md5 hash of it's name
-        dirs_nodes = tree.children(base.identifier)
-        for dir in dirs_nodes:
-            newbase = tree.get_node(dir.identifier)
-            build_recursive_tree(tree, newbase, depth, width)
-    else:
-        return
+            )
+            stack.append((node.identifier, depth - 1))
 
 
 class Directory(object):
+    __slots__ = ("_name", "_files")
+
     def __init__(self):
         self._name = get_random_string(64)
         self._files = [
-            File() for _ in range2(MAX_FILES_PER_DIR)
+            File() for _ in range(MAX_FILES_PER_DIR)
         ]  # Each directory contains 1000 files
 
     @property
@@ -74,6 +68,8 @@ class Directory(object):
 
 
 class File(object):
+    __slots__ = ("_name",)
+
     def __init__(self):
         self._name = get_random_string(64)
 
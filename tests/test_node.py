@@ -1,7 +1,9 @@
+import pickle
 import unittest
 
 from collections import defaultdict
 from treelib import Node
+from treelib.exceptions import NodePropertyError
 
 
 class NodeCase(unittest.TestCase):
@@ -47,8 +49,21 @@ class NodeCase(unittest.TestCase):
         self.node1.update_successors("identifier 2", tree_id="tree 1")
         self.assertEqual(self.node1.successors("tree 1"), ["identifier 2"])
         self.assertEqual(self.node1._successors["tree 1"], ["identifier 2"])
+        self.node1.update_successors(
+            "identifier 2", Node.REPLACE, "identifier 3", tree_id="tree 1"
+        )
+        self.assertEqual(self.node1.successors("tree 1"), ["identifier 3"])
+        with self.assertRaises(NodePropertyError):
+            self.node1.update_successors("identifier 3", Node.REPLACE, tree_id="tree 1")
+        with self.assertRaises(NotImplementedError):
+            self.node1.update_successors("identifier 3", -1, tree_id="tree 1")
+        self.node1.update_successors("identifier 3", Node.DELETE, tree_id="tree 1")
+        self.assertEqual(self.node1.successors("tree 1"), [])
         self.node1.set_successors([], tree_id="tree 1")
         self.assertEqual(self.node1._successors["tree 1"], [])
+        # the list handed out for a leaf is the stored one
+        self.node2.successors("tree 1").append("identifier 3")
+        self.assertEqual(self.node2.successors("tree 1"), ["identifier 3"])
 
     def test_set_bpointer(self):
         # retro-compatibility
@@ -76,6 +91,47 @@ class NodeCase(unittest.TestCase):
         self.assertEqual(self.node1.is_leaf("tree 1"), False)
         self.assertEqual(self.node2.is_leaf("tree 1"), True)
 
+    def test_slots(self):
+        self.assertFalse(hasattr(self.node1, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.node1.color = "red"
+
+        class SubNode(Node):
+            pass
+
+        node = SubNode("Test Three", "identifier 3")
+        node.color = "red"
+        self.assertEqual(node.color, "red")
+
+    def test_unpickle_dict_state(self):
+        # nodes pickled before Node had __slots__ carry a plain __dict__
+        state = {
+            "_identifier": "identifier 3",
+            "_tag": "Test Three",
+            "expanded": True,
+            "_predecessor": {"tree 1": "identifier 1"},
+            "_successors": defaultdict(list, {"tree 1": ["identifier 4"]}),
+            "data": "payload",
+            "_initial_tree_id": "tree 1",
+        }
+
+        class LegacyNode(object):
+            def __reduce__(self):
+                return Node.__new__, (Node,), state
+
+        node = pickle.loads(pickle.dumps(LegacyNode()))
+        self.assertIsInstance(node, Node)
+        self.assertEqual(node.tag, "Test Three")
+        self.assertEqual(node.identifier, "identifier 3")
+        self.assertEqual(node.predecessor("tree 1"), "identifier 1")
+        self.assertEqual(node.successors("tree 1"), ["identifier 4"])
+        self.assertEqual(node.data, "payload")
+        self.assertEqual(node.bpointer, "identifier 1")
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            node = pickle.loads(pickle.dumps(self.node1, protocol=protocol))
+            self.assertEqual(node.identifier, "identifier 1")
+
     def test_data(self):
         class Flower(object):
             def __init__(self, color):
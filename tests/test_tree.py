@@ -5,6 +5,7 @@ from __future__ import unicode_literals
 import sys
 
 import os
+import tempfile
 
 import unittest
 from treelib import Tree, Node
@@ -157,6 +158,13 @@ class TreeCase(unittest.TestCase):
         else:
             self.fail("The absent node should be declaimed.")
 
+    def test_is_branch_of_leaf_is_stored(self):
+        t = Tree(identifier="T")
+        t.create_node("R", "r")
+        t.create_node("A", "a", parent="r")
+        t.is_branch("a").append("zz")
+        self.assertEqual(t["a"].successors("T"), ["zz"])
+
     def test_remove_node(self):
         self.tree.create_node("Jill", "jill", parent="george")
         self.tree.create_node("Mark", "mark", parent="jill")
@@ -164,6 +172,19 @@ class TreeCase(unittest.TestCase):
         self.assertEqual(self.tree.get_node("jill") is None, True)
         self.assertEqual(self.tree.get_node("mark") is None, True)
 
+    def test_remove_node_resets_pointers(self):
+        self.tree.create_node("Jill", "jill", parent="george")
+        for i in range(100):
+            self.tree.create_node("Kid %d" % i, "kid%d" % i, parent="jill")
+        jill = self.tree["jill"]
+        kid = self.tree["kid50"]
+        self.assertEqual(self.tree.remove_node("jill"), 101)
+        self.assertEqual(self.tree.get_node("kid50") is None, True)
+        self.assertEqual(self.tree.children("george"), [])
+        self.assertEqual(jill.predecessor(self.tree.identifier), None)
+        self.assertEqual(jill.successors(self.tree.identifier), [])
+        self.assertEqual(kid.predecessor(self.tree.identifier), None)
+
     def test_tree_wise_depth(self):
         # Try getting the level of this tree
         self.assertEqual(self.tree.depth(), 2)
@@ -462,6 +483,18 @@ class TreeCase(unittest.TestCase):
 """,
         )
 
+        # deep paste leaves the pasted tree untouched
+        t1 = self.get_t1()
+        t2 = self.get_t2()
+        t1.paste(nid="b", new_tree=t2, deep=True)
+        self.assertEqual(t1.parent("r2").identifier, "b")
+        self.assertEqual(
+            set(t1._nodes.keys()), {"r", "a", "a1", "b", "c", "d", "d1", "r2"}
+        )
+        self.assertIsNot(t1["d"], t2["d"])
+        t1["d"].tag = "D'"
+        self.assertEqual(t2["d"].tag, "D")
+
     def test_rsearch(self):
         for nid in ["hárry", "jane", "diane"]:
             self.assertEqual(nid in self.tree.rsearch("diane"), True)
@@ -533,6 +566,8 @@ class TreeCase(unittest.TestCase):
         self.assertEqual(self.tree.size(level=2), 2)
         self.assertEqual(self.tree.size(level=1), 2)
         self.assertEqual(self.tree.size(level=0), 1)
+        self.assertEqual(self.tree.size(level=3), 0)
+        self.assertEqual(self.tree.size(level=10**9), 0)
 
     def test_print_backend(self):
         expected_result = """\
@@ -557,6 +592,18 @@ Hárry
             sys.stdout.close()
             sys.stdout = sys.__stdout__  # stops from printing to console
 
+    def test_save2file(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, "tree.txt")
+        self.tree.save2file(path)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read().decode("utf-8"), self.tree.show(stdout=False))
+        # the file is appended to, not truncated
+        self.tree.save2file(path)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read().decode("utf-8"), self.tree.show(stdout=False) * 2)
+
     def tearDown(self):
         self.tree = None
         self.copytree = None
@@ -578,6 +625,28 @@ Hárry
 """,
         )
 
+    def test_show_deep_tree(self):
+        t = Tree()
+        t.create_node("0", 0)
+        depth = sys.getrecursionlimit() + 10
+        for i in range(1, depth):
+            t.create_node(str(i), i, parent=i - 1)
+        lines = t.show(stdout=False).splitlines()
+        self.assertEqual(len(lines), depth)
+        self.assertEqual(lines[-1], " " * 4 * (depth - 2) + "└── " + str(depth - 1))
+
+    def test_to_dict_deep_tree(self):
+        t = Tree()
+        t.create_node("0", 0)
+        depth = sys.getrecursionlimit() + 10
+        for i in range(1, depth):
+            t.create_node(str(i), i, parent=i - 1)
+        d = t.to_dict()
+        for i in range(depth - 1):
+            self.assertEqual(list(d.keys()), [str(i)])
+            (d,) = d[str(i)]["children"]
+        self.assertEqual(d, str(depth - 1))
+
     def test_all_nodes_itr(self):
         """
         tests: Tree.all_nodes_iter
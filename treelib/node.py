@@ -43,6 +43,17 @@ class Node(object):
     #: Mode constants for routine `update_fpointer()`.
     (ADD, DELETE, INSERT, REPLACE) = list(range(4))
 
+    __slots__ = (
+        "_identifier",
+        "_tag",
+        "expanded",
+        "_predecessor",
+        "_successors",
+        "data",
+        "_initial_tree_id",
+        "__weakref__",
+    )
+
     def __init__(self, tag=None, identifier=None, expanded=True, data=None):
         """Create a new Node object to be placed inside a Tree object"""
 
@@ -81,7 +92,7 @@ class Node(object):
     def _set_identifier(self, nid):
         """Initialize self._set_identifier"""
         if nid is None:
-            self._identifier = str(uuid.uuid1())
+            self._identifier = str(uuid.uuid4())
         else:
             self._identifier = nid
 
@@ -169,41 +180,26 @@ class Node(object):
         if nid is None:
             return
 
-        def _manipulator_append():
+        if mode == self.ADD:
             self.successors(tree_id).append(nid)
-
-        def _manipulator_delete():
+        elif mode == self.DELETE:
             if nid in self.successors(tree_id):
                 self.successors(tree_id).remove(nid)
             else:
                 warn("Nid %s wasn't present in fpointer" % nid)
-
-        def _manipulator_insert():
+        elif mode == self.INSERT:
             warn("WARNING: INSERT is deprecated to ADD mode")
             self.update_successors(nid, tree_id=tree_id)
-
-        def _manipulator_replace():
+        elif mode == self.REPLACE:
             if replace is None:
                 raise NodePropertyError(
                     'Argument "repalce" should be provided when mode is {}'.format(mode)
                 )
             ind = self.successors(tree_id).index(nid)
             self.successors(tree_id)[ind] = replace
-
-        manipulator_lookup = {
-            self.ADD: "_manipulator_append",
-            self.DELETE: "_manipulator_delete",
-            self.INSERT: "_manipulator_insert",
-            self.REPLACE: "_manipulator_replace",
-        }
-
-        if mode not in manipulator_lookup:
+        else:
             raise NotImplementedError("Unsupported node updating mode %s" % str(mode))
 
-        f_name = manipulator_lookup.get(mode)
-        f = locals()[f_name]
-        return f()
-
     @property
     def identifier(self):
         """
@@ -269,11 +265,33 @@ class Node(object):
         """Set the value of `_tag`."""
         self._tag = value if value is not None else None
 
+    def __getstate__(self):
+        """
+        Pickled state as a (`__dict__`, slots) pair, so that every pickle
+        protocol can handle the slotted class.
+        """
+        slots = {}
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                if name not in ("__dict__", "__weakref__") and hasattr(self, name):
+                    slots[name] = getattr(self, name)
+        return getattr(self, "__dict__", None), slots
+
+    def __setstate__(self, state):
+        """
+        Restore pickled state. Nodes pickled before `__slots__` was declared
+        carry a plain `__dict__`, so a dict state is accepted as well.
+        """
+        if isinstance(state, tuple):
+            state, slots = state
+        else:
+            slots = None
+        for attrs in (state, slots):
+            if attrs:
+                for name, value in attrs.items():
+                    setattr(self, name, value)
+
     def __repr__(self):
-        name = self.__class__.__name__
-        kwargs = [
-            "tag={0}".format(self.tag),
-            "identifier={0}".format(self.identifier),
-            "data={0}".format(self.data),
-        ]
-        return "%s(%s)" % (name, ", ".join(kwargs))
+        return "{0}(tag={1}, identifier={2}, data={3})".format(
+            self.__class__.__name__, self.tag, self.identifier, self.data
+        )
@@ -37,6 +37,7 @@ except ImportError:
 import codecs
 import json
 import uuid
+from collections import deque
 from copy import deepcopy
 from six import python_2_unicode_compatible, iteritems
 
@@ -128,7 +129,7 @@ class Tree(object):
     def _set_identifier(self, nid):
         """Initialize self._set_identifier"""
         if nid is None:
-            self._identifier = str(uuid.uuid1())
+            self._identifier = str(uuid.uuid4())
         else:
             self._identifier = nid
 
@@ -144,12 +145,13 @@ class Tree(object):
         return len(self._nodes)
 
     def __str__(self):
-        self._reader = ""
+        lines = []
 
         def write(line):
-            self._reader += line.decode("utf-8") + "\n"
+            lines.append(line.decode("utf-8") + "\n")
 
         self.__print_backend(func=write)
+        self._reader = "".join(lines)
         return self._reader
 
     def __print_backend(
@@ -222,13 +224,11 @@ class Tree(object):
                 return node
 
         # iter with func
-        for pre, node in self.__get(
-            nid, level, filter, key, reverse, line_type, sorting
-        ):
+        for pre, node in self.__get(nid, filter, key, reverse, line_type, sorting):
             label = get_label(node)
             func("{0}{1}".format(pre, label).encode("utf-8"))
 
-    def __get(self, nid, level, filter_, key, reverse, line_type, sorting):
+    def __get(self, nid, filter_, key, reverse, line_type, sorting):
         # default filter
         if filter_ is None:
 
@@ -245,44 +245,51 @@ class Tree(object):
             "ascii-emh": ("\u2502", "\u255e\u2550\u2550 ", "\u2558\u2550\u2550 "),
         }[line_type]
 
-        return self.__get_iter(nid, level, filter_, key, reverse, dt, [], sorting)
+        return self.__get_iter(nid, filter_, key, reverse, dt, sorting)
 
-    def __get_iter(self, nid, level, filter_, key, reverse, dt, is_last, sorting):
+    def __get_iter(self, nid, filter_, key, reverse, dt, sorting):
+        """
+        Walk the tree in display order with an explicit stack, so that deep
+        trees are not limited by the interpreter recursion limit.
+
+        Each stack entry holds a node, the line prefix of the node itself and
+        the leading part shared by the prefixes of all its children.
+        """
         dt_vertical_line, dt_line_box, dt_line_corner = dt
 
+        tid = self._identifier
+        node_of = self.__getitem__
+
         nid = self.root if nid is None else nid
-        node = self[nid]
+        stack = [(node_of(nid), "", "")]
 
-        if level == self.ROOT:
-            yield "", node
-        else:
-            leading = "".join(
-                map(
-                    lambda x: dt_vertical_line + " " * 3 if not x else " " * 4,
-                    is_last[0:-1],
-                )
-            )
-            lasting = dt_line_corner if is_last[-1] else dt_line_box
-            yield leading + lasting, node
+        while stack:
+            node, prefix, leading = stack.pop()
+            yield prefix, node
 
-        if filter_(node) and node.expanded:
-            children = [
-                self[i] for i in node.successors(self._identifier) if filter_(self[i])
-            ]
-            idxlast = len(children) - 1
-            if sorting:
-                if key:
-                    children.sort(key=key, reverse=reverse)
-                elif reverse:
-                    children = reversed(children)
-            level += 1
-            for idx, child in enumerate(children):
-                is_last.append(idx == idxlast)
-                for item in self.__get_iter(
-                    child.identifier, level, filter_, key, reverse, dt, is_last, sorting
-                ):
-                    yield item
-                is_last.pop()
+            if filter_(node) and node.expanded:
+                children = [n for n in map(node_of, node.successors(tid)) if filter_(n)]
+                if sorting:
+                    if key:
+                        children.sort(key=key, reverse=reverse)
+                    elif reverse:
+                        children.reverse()
+
+                # push the last child first so the first child is popped first
+                idxlast = len(children) - 1
+                for idx in range(idxlast, -1, -1):
+                    if idx == idxlast:
+                        stack.append(
+                            (children[idx], leading + dt_line_corner, leading + " " * 4)
+                        )
+                    else:
+                        stack.append(
+                            (
+                                children[idx],
+                                leading + dt_line_box,
+                                leading + dt_vertical_line + " " * 3,
+                            )
+                        )
 
     def __update_bpointer(self, nid, parent_id):
         """set self[nid].bpointer"""
@@ -305,10 +312,9 @@ class Tree(object):
                 "First parameter must be object of {}".format(self.node_class)
             )
 
-        if node.identifier in self._nodes:
-            raise DuplicatedNodeIdError(
-                "Can't create node " "with ID '%s'" % node.identifier
-            )
+        nid = node.identifier
+        if nid in self._nodes:
+            raise DuplicatedNodeIdError("Can't create node " "with ID '%s'" % nid)
 
         pid = parent.identifier if isinstance(parent, self.node_class) else parent
 
@@ -316,13 +322,19 @@ class Tree(object):
             if self.root is not None:
                 raise MultipleRootError("A tree takes one root merely.")
             else:
-                self.root = node.identifier
-        elif not self.contains(pid):
-            raise NodeIDAbsentError("Parent node '%s' " "is not in the tree" % pid)
-
-        self._nodes.update({node.identifier: node})
-        self.__update_fpointer(pid, node.identifier, self.node_class.ADD)
-        self.__update_bpointer(node.identifier, pid)
+                self.root = nid
+            parent_node = None
+        else:
+            parent_node = self._nodes.get(pid)
+            if parent_node is None:
+                raise NodeIDAbsentError("Parent node '%s' " "is not in the tree" % pid)
+
+        self._nodes[nid] = node
+        if parent_node is not None:
+            parent_node.update_successors(
+                nid, self.node_class.ADD, tree_id=self._identifier
+            )
+        node.set_predecessor(pid, self._identifier)
         node.set_initial_tree_id(self._identifier)
 
     def all_nodes(self):
@@ -399,10 +411,15 @@ class Tree(object):
         ret = 0
         if node is None:
             # Get maximum level of this tree
-            leaves = self.leaves()
-            for leave in leaves:
-                level = self.level(leave.identifier)
-                ret = level if level >= ret else ret
+            if self.root is not None:
+                frontier = self[self.root].successors(self._identifier)
+                while frontier:
+                    ret += 1
+                    frontier = [
+                        cid
+                        for nid in frontier
+                        for cid in self[nid].successors(self._identifier)
+                    ]
         else:
             # Get level of the given node
             if not isinstance(node, self.node_class):
@@ -444,29 +461,31 @@ class Tree(object):
             raise NodeIDAbsentError("Node '%s' is not in the tree" % nid)
 
         filter = (lambda x: True) if (filter is None) else filter
+        tid = self._identifier
+        node_of = self.__getitem__
         if filter(self[nid]):
             yield nid
-            queue = [
-                self[i]
-                for i in self[nid].successors(self._identifier)
-                if filter(self[i])
-            ]
+            queue = [n for n in map(node_of, self[nid].successors(tid)) if filter(n)]
             if mode in [self.DEPTH, self.WIDTH]:
                 if sorting:
                     queue.sort(key=key, reverse=reverse)
+                if mode == self.DEPTH:
+                    queue.reverse()
+                    pop = queue.pop
+                else:
+                    queue = deque(queue)
+                    pop = queue.popleft
                 while queue:
-                    yield queue[0].identifier
+                    node = pop()
+                    yield node.identifier
                     expansion = [
-                        self[i]
-                        for i in queue[0].successors(self._identifier)
-                        if filter(self[i])
+                        n for n in map(node_of, node.successors(tid)) if filter(n)
                     ]
                     if sorting:
                         expansion.sort(key=key, reverse=reverse)
-                    if mode is self.DEPTH:
-                        queue = expansion + queue[1:]  # depth-first
-                    elif mode is self.WIDTH:
-                        queue = queue[1:] + expansion  # width-first
+                    if mode == self.DEPTH:
+                        expansion.reverse()  # depth-first
+                    queue.extend(expansion)
 
             elif mode is self.ZIGZAG:
                 # Suggested by Ilya Kuprik (ilya-spy@ynadex.ru).
@@ -476,9 +495,7 @@ class Tree(object):
                 direction = False
                 while stack:
                     expansion = [
-                        self[i]
-                        for i in stack[0].successors(self._identifier)
-                        if filter(self[i])
+                        n for n in map(node_of, stack[0].successors(tid)) if filter(n)
                     ]
                     yield stack.pop(0).identifier
                     if direction:
@@ -539,9 +556,9 @@ class Tree(object):
                 if node.is_leaf(self._identifier):
                     leaves.append(node)
         else:
-            for node in self.expand_tree(nid):
-                if self[node].is_leaf(self._identifier):
-                    leaves.append(self[node])
+            for node in map(self.__getitem__, self.expand_tree(nid)):
+                if node.is_leaf(self._identifier):
+                    leaves.append(node)
         return leaves
 
     def level(self, nid, filter=None):
@@ -685,14 +702,15 @@ class Tree(object):
         if not self.contains(nid):
             raise NodeIDAbsentError("Node '%s' is not in the tree" % nid)
 
-        set_joint = set(new_tree._nodes) & set(self._nodes)  # joint keys
+        # joint keys
+        set_joint = {cid for cid in new_tree._nodes if cid in self._nodes}
         if set_joint:
             raise ValueError("Duplicated nodes %s exists." % list(map(text, set_joint)))
 
         for cid, node in iteritems(new_tree.nodes):
             if deep:
-                node = deepcopy(new_tree[node])
-            self._nodes.update({cid: node})
+                node = deepcopy(node)
+            self._nodes[cid] = node
             node.clone_pointers(new_tree.identifier, self._identifier)
 
         self.__update_bpointer(new_tree.root, nid)
@@ -728,12 +746,21 @@ class Tree(object):
              ['harry', 'bill']]
 
         """
-        res = []
-
-        for leaf in self.leaves():
-            res.append([nid for nid in self.rsearch(leaf.identifier)][::-1])
+        paths = {}
+        if self.root is not None:
+            path = []
+            stack = [(self.root, 0)]
+            while stack:
+                nid, depth = stack.pop()
+                del path[depth:]
+                path.append(nid)
+                children = self[nid].successors(self._identifier)
+                if children:
+                    stack.extend((cid, depth + 1) for cid in children)
+                else:
+                    paths[nid] = list(path)
 
-        return res
+        return [paths[leaf.identifier] for leaf in self.leaves()]
 
     def remove_node(self, identifier):
         """Remove a node indicated by 'identifier' with all its successors.
@@ -744,22 +771,16 @@ class Tree(object):
 
         parent = self[identifier].predecessor(self._identifier)
 
+        # Update parent info
+        self.__update_fpointer(parent, identifier, self.node_class.DELETE)
+
         # Remove node and its children
         removed = list(self.expand_tree(identifier))
 
         for id_ in removed:
             if id_ == self.root:
                 self.root = None
-            self.__update_bpointer(id_, None)
-            for cid in self[id_].successors(self._identifier) or []:
-                self.__update_fpointer(id_, cid, self.node_class.DELETE)
-
-        # Update parent info
-        self.__update_fpointer(parent, identifier, self.node_class.DELETE)
-        self.__update_bpointer(identifier, None)
-
-        for id_ in removed:
-            self.nodes.pop(id_)
+            self._nodes.pop(id_).reset_pointers(self._identifier)
         return len(removed)
 
     def remove_subtree(self, nid, identifier=None):
@@ -797,11 +818,11 @@ class Tree(object):
         for id_ in removed:
             if id_ == self.root:
                 self.root = None
-            st._nodes.update({id_: self._nodes.pop(id_)})
-            st[id_].clone_pointers(self._identifier, st.identifier)
-            st[id_].reset_pointers(self._identifier)
+            node = st._nodes[id_] = self._nodes.pop(id_)
+            node.clone_pointers(self._identifier, st.identifier)
+            node.reset_pointers(self._identifier)
             if id_ == nid:
-                st[id_].set_predecessor(None, st.identifier)
+                node.set_predecessor(None, st.identifier)
         self.__update_fpointer(parent, nid, self.node_class.DELETE)
         return st
 
@@ -818,17 +839,14 @@ class Tree(object):
         if not self.contains(nid):
             raise NodeIDAbsentError("Node '%s' is not in the tree" % nid)
 
-        filter = (lambda x: True) if (filter is None) else filter
-
         current = nid
         while current is not None:
-            if filter(self[current]):
+            node = self[current]
+            if filter is None or filter(node):
                 yield current
             # subtree() hasn't update the bpointer
             current = (
-                self[current].predecessor(self._identifier)
-                if self.root != current
-                else None
+                node.predecessor(self._identifier) if self.root != current else None
             )
 
     def save2file(
@@ -847,13 +865,7 @@ class Tree(object):
         """
         Save the tree into file for offline analysis.
         """
-
-        def _write_line(line, f):
-            f.write(line + b"\n")
-
-        def handler(x):
-            return _write_line(x, open(filename, "ab"))
-
+        lines = []
         self.__print_backend(
             nid,
             level,
@@ -864,9 +876,13 @@ class Tree(object):
             line_type,
             data_property,
             sorting,
-            func=handler,
+            func=lines.append,
         )
 
+        if lines:
+            with open(filename, "ab") as f:
+                f.write(b"\n".join(lines) + b"\n")
+
     def show(
         self,
         nid=None,
@@ -907,10 +923,10 @@ class Tree(object):
             @reverse parameters are ignored.
         :return: None
         """
-        self._reader = ""
+        lines = []
 
         def write(line):
-            self._reader += line.decode("utf-8") + "\n"
+            lines.append(line.decode("utf-8") + "\n")
 
         try:
             self.__print_backend(
@@ -928,6 +944,7 @@ class Tree(object):
         except NodeIDAbsentError:
             print("Tree is empty")
 
+        self._reader = "".join(lines)
         if stdout:
             print(self._reader.encode("utf-8"))
         else:
@@ -965,17 +982,23 @@ class Tree(object):
         else:
             try:
                 level = int(level)
-                return len(
-                    [
-                        node
-                        for node in self.all_nodes_itr()
-                        if self.level(node.identifier) == level
-                    ]
-                )
             except Exception:
                 raise TypeError(
                     "level should be an integer instead of '%s'" % type(level)
                 )
+            if level < 0 or self.root is None:
+                return 0
+
+            frontier = [self.root]
+            for _ in range(level):
+                frontier = [
+                    cid
+                    for nid in frontier
+                    for cid in self[nid].successors(self._identifier)
+                ]
+                if not frontier:
+                    break
+            return len(frontier)
 
     def subtree(self, nid, identifier=None):
         """
@@ -999,13 +1022,14 @@ class Tree(object):
 
         st.root = nid
         for node_n in self.expand_tree(nid):
-            st._nodes.update({self[node_n].identifier: self[node_n]})
+            node = self[node_n]
+            st._nodes[node.identifier] = node
             # define nodes parent/children in this tree
             # all pointers are the same as copied tree, except the root
-            st[node_n].clone_pointers(self._identifier, st.identifier)
+            node.clone_pointers(self._identifier, st.identifier)
             if node_n == nid:
                 # reset root parent for the new tree
-                st[node_n].set_predecessor(None, st.identifier)
+                node.set_predecessor(None, st.identifier)
         return st
 
     def update_node(self, nid, **attrs):
@@ -1049,28 +1073,35 @@ class Tree(object):
         """Transform the whole tree into a dict."""
 
         nid = self.root if (nid is None) else nid
-        ntag = self[nid].tag
-        tree_dict = {ntag: {"children": []}}
-        if with_data:
-            tree_dict[ntag]["data"] = self[nid].data
 
-        if self[nid].expanded:
-            queue = [self[i] for i in self[nid].successors(self._identifier)]
+        result = []
+        stack = [(nid, result, key)]
+        while stack:
+            nid, siblings, key = stack.pop()
+            node = self[nid]
+            ntag = node.tag
+            if not node.expanded:
+                siblings.append(None)
+                continue
+
+            queue = [self[i] for i in node.successors(self._identifier)]
+            if not queue:
+                siblings.append(ntag if not with_data else {ntag: {"data": node.data}})
+                continue
+
+            tree_dict = {ntag: {"children": []}}
+            if with_data:
+                tree_dict[ntag]["data"] = node.data
+            siblings.append(tree_dict)
+
             key = (lambda x: x) if (key is None) else key
             if sort:
                 queue.sort(key=key, reverse=reverse)
 
-            for elem in queue:
-                tree_dict[ntag]["children"].append(
-                    self.to_dict(
-                        elem.identifier, with_data=with_data, sort=sort, reverse=reverse
-                    )
-                )
-            if len(tree_dict[ntag]["children"]) == 0:
-                tree_dict = (
-                    self[nid].tag if not with_data else {ntag: {"data": self[nid].data}}
-                )
-            return tree_dict
+            children = tree_dict[ntag]["children"]
+            stack.extend((elem.identifier, children, None) for elem in reversed(queue))
+
+        return result[0]
 
     def to_json(self, with_data=False, sort=True, reverse=False):
         """To format the tree in JSON format."""